@@ -50,6 +50,13 @@ except ImportError:
 # Import template extraction utilities
 from template_utils import extract_from_template_response
 
+# Dict fields that may carry the text of an LLM response, in priority order
+_TEXT_FIELDS = ('answer', 'text', 'content', 'response', 'result')
+# One leading bullet marker ("- ", "* ", "• ") and the spaces after it; a sign that follows it is kept
+_BULLET_RE = re.compile(r'^[-*\u2022]\s*')
+# Leading list numbering such as "1. " or "1) "
+_NUM_PREFIX_RE = re.compile(r'^\d+[\.\)]\s*')
+
 def extract_text_from_response(response: Any) -> str:
     """
     Enhanced extraction for both template and JSON responses.
@@ -67,10 +74,11 @@ def extract_text_from_response(response: Any) -> str:
         return response
     elif isinstance(response, dict):
         # Try common fields that might contain the text response
-        for field in ['answer', 'text', 'content', 'response', 'result']:
-            if field in response and response[field]:
+        for field in _TEXT_FIELDS:
+            value = response.get(field)
+            if value:
                 # Recursively extract in case the field contains template
-                return extract_text_from_response(response[field])
+                return extract_text_from_response(value)
         # Fallback to string representation
         return str(response)
     else:
@@ -92,9 +100,9 @@ def format_llm_response_as_list(response: Any) -> List[str]:
     cleaned_lines = []
     for line in lines:
         # Remove common bullet point formats
-        line = line.lstrip('- ').lstrip('* ').lstrip('• ')
+        line = _BULLET_RE.sub('', line)
         # Remove numbering like "1. " or "1) "
-        line = re.sub(r'^\d+[\.\)]\s*', '', line)
+        line = _NUM_PREFIX_RE.sub('', line)
         if line:
             cleaned_lines.append(line)
     
@@ -544,15 +552,18 @@ def calculate_statistical_metrics(values: np.ndarray, metric: str = "all") -> Di
     }
     
     if metric == "all":
+        # Quartiles share one partition; median stays on np.median, std reuses the variance pass
+        q25, q75 = np.percentile(values, [25, 75])
+        variance = np.var(values)
         result.update({
             "mean": float(np.mean(values)),
             "median": float(np.median(values)),
-            "std": float(np.std(values)),
-            "variance": float(np.var(values)),
+            "std": float(np.sqrt(variance)),
+            "variance": float(variance),
             "min": float(np.min(values)),
             "max": float(np.max(values)),
-            "q25": float(np.percentile(values, 25)),
-            "q75": float(np.percentile(values, 75))
+            "q25": float(q25),
+            "q75": float(q75)
         })
     else:
         stats_map = {
@@ -12,6 +12,17 @@ from constants import DB_PATH, CSV_PATH, VENDOR_COL, COST_COL, DESC_COL, COMMODI
 
 logger = logging.getLogger(__name__)
 
+# Applied to long-lived connections, where the cache and mmap window outlive a single query:
+# WAL journal, relaxed fsync, 64 MB page cache, in-memory temp tables, 256 MB mmap, 30 s busy timeout
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=30000",
+)
+
 class DatabaseManager:
     """Singleton database manager for connection pooling and utilities"""
     
@@ -137,25 +148,15 @@ class DatabaseManager:
         stats = {}
         
         try:
-            # Total records
-            stats['total_records'] = self.execute_scalar(
-                "SELECT COUNT(*) FROM procurement"
-            )
-            
-            # Unique vendors
-            stats['unique_vendors'] = self.execute_scalar(
-                f"SELECT COUNT(DISTINCT {VENDOR_COL}) FROM procurement"
-            )
-            
-            # Total spending
-            stats['total_spending'] = self.execute_scalar(
-                f"SELECT SUM(CAST({COST_COL} AS FLOAT)) FROM procurement WHERE {COST_COL} IS NOT NULL"
-            )
-            
-            # Average order
-            stats['average_order'] = self.execute_scalar(
-                f"SELECT AVG(CAST({COST_COL} AS FLOAT)) FROM procurement WHERE {COST_COL} IS NOT NULL"
-            )
+            # Record count, unique vendors, total spending and average order in one pass
+            df = self.execute_query(f"""
+            SELECT COUNT(*) AS total_records,
+                   COUNT(DISTINCT {VENDOR_COL}) AS unique_vendors,
+                   SUM(CAST({COST_COL} AS FLOAT)) AS total_spending,
+                   AVG(CAST({COST_COL} AS FLOAT)) AS average_order
+            FROM procurement
+            """)
+            stats.update({col: df[col].iloc[0] for col in df.columns})
             
             # Database size
             stats['database_size_mb'] = os.path.getsize(self.db_path) / (1024 * 1024)
@@ -228,6 +229,12 @@ class DatabaseManager:
 # Singleton instance
 db_manager = DatabaseManager()
 
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply CONNECTION_PRAGMAS to a long-lived connection"""
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 # Utility functions for backward compatibility
 def get_db_connection():
     """Get database connection (for backward compatibility)"""
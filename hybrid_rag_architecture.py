@@ -16,7 +16,7 @@ from typing import Dict, Any, Optional, List, Tuple, Set
 from functools import lru_cache
 from difflib import SequenceMatcher
 from datetime import datetime
-from template_utils import extract_template_response
+from template_utils import extract_template_response, extract_numbered_blocks, _REC_BLOCK, _FINDING_BLOCK
 
 # Import shared modules
 from constants import (
@@ -37,7 +37,7 @@ from constants import (
     CACHE_TTL_BY_TYPE, CACHE_KEY_PREFIXES,
     FEATURES
 )
-from database_utils import db_manager, get_db_connection, safe_execute_query
+from database_utils import db_manager, get_db_connection, safe_execute_query, configure_connection
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -70,6 +70,12 @@ except ImportError:
 # TEMPLATE EXTRACTION UTILITIES
 # ============================================
 
+# Numbered <VENDORn> blocks share the single-pass lookahead form of template_utils' REC/FINDING patterns
+_VENDOR_BLOCK = re.compile(
+    r'(?=<VENDOR(10|[1-9])>\s*<NAME>(.*?)</NAME>\s*<PERFORMANCE>(.*?)</PERFORMANCE>\s*'
+    r'(?:<STRENGTHS>(.*?)</STRENGTHS>)?\s*(?:<CONCERNS>(.*?)</CONCERNS>)?\s*</VENDOR\1>)',
+    re.IGNORECASE | re.DOTALL
+)
 
 
 def extract_recommendations_template(response_text: str) -> str:
@@ -83,18 +89,12 @@ def extract_recommendations_template(response_text: str) -> str:
         return insufficient_match.group(1).strip()
     
     # Extract numbered recommendations
-    for i in range(1, 11):  # Support up to 10 recommendations
-        rec_pattern = f'<REC{i}>\\s*<ACTION>(.*?)</ACTION>\\s*<JUSTIFICATION>(.*?)</JUSTIFICATION>\\s*(?:<PRIORITY>(.*?)</PRIORITY>)?\\s*</REC{i}>'
-        match = re.search(rec_pattern, response_text, re.IGNORECASE | re.DOTALL)
-        if match:
-            action = match.group(1).strip()
-            justification = match.group(2).strip()
-            priority = match.group(3).strip() if match.group(3) else "Medium"
-            recommendations.append({
-                'action': action,
-                'justification': justification,
-                'priority': priority
-            })
+    for _, (action, justification, priority) in extract_numbered_blocks(_REC_BLOCK, response_text):
+        recommendations.append({
+            'action': action.strip(),
+            'justification': justification.strip(),
+            'priority': priority.strip() if priority else "Medium"
+        })
     
     if recommendations:
         formatted = "### Strategic Recommendations\n\n"
@@ -117,17 +117,14 @@ def extract_comparison_template(response_text: str) -> str:
     
     # Extract vendor details
     vendors_data = []
-    for i in range(1, 11):
-        vendor_pattern = f'<VENDOR{i}>\\s*<NAME>(.*?)</NAME>\\s*<PERFORMANCE>(.*?)</PERFORMANCE>\\s*(?:<STRENGTHS>(.*?)</STRENGTHS>)?\\s*(?:<CONCERNS>(.*?)</CONCERNS>)?\\s*</VENDOR{i}>'
-        match = re.search(vendor_pattern, response_text, re.IGNORECASE | re.DOTALL)
-        if match:
-            vendor_info = {
-                'name': match.group(1).strip(),
-                'performance': match.group(2).strip(),
-                'strengths': match.group(3).strip() if match.group(3) else "",
-                'concerns': match.group(4).strip() if match.group(4) else ""
-            }
-            vendors_data.append(vendor_info)
+    for _, (name, performance, strengths, concerns) in extract_numbered_blocks(_VENDOR_BLOCK, response_text):
+        vendor_info = {
+            'name': name.strip(),
+            'performance': performance.strip(),
+            'strengths': strengths.strip() if strengths else "",
+            'concerns': concerns.strip() if concerns else ""
+        }
+        vendors_data.append(vendor_info)
     
     # Format vendor data
     for vendor in vendors_data:
@@ -157,11 +154,8 @@ def extract_statistical_template(response_text: str) -> str:
     
     # Extract findings
     findings = []
-    for i in range(1, 11):
-        finding_pattern = f'<FINDING{i}>(.*?)</FINDING{i}>'
-        match = re.search(finding_pattern, response_text, re.IGNORECASE | re.DOTALL)
-        if match:
-            findings.append(f"{i}. {match.group(1).strip()}")
+    for i, (finding,) in extract_numbered_blocks(_FINDING_BLOCK, response_text):
+        findings.append(f"{i}. {finding.strip()}")
     
     if findings:
         result.append("**Key Findings:**")
@@ -551,9 +545,7 @@ class HybridProcurementRAG:
             db_manager.ensure_database_exists()
             
             # Get connection for the session
-            self.sql_conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-            self.sql_conn.execute("PRAGMA journal_mode=WAL")
-            self.sql_conn.execute("PRAGMA cache_size=10000")
+            self.sql_conn = configure_connection(sqlite3.connect(DB_PATH, check_same_thread=False))
             logger.info(f"Connected to database: {DB_PATH}")
             self._validate_database_schema()
         except sqlite3.Error as e:
@@ -1387,15 +1379,18 @@ class HybridProcurementRAG:
         }
 
         if metric == "all":
+            # Quartiles share one partition; median stays on np.median, std reuses the variance pass
+            q25, q75 = np.percentile(values, [25, 75])
+            variance = np.var(values)
             result.update({
                 "mean": float(np.mean(values)),
                 "median": float(np.median(values)),
-                "std": float(np.std(values)),
-                "variance": float(np.var(values)),
+                "std": float(np.sqrt(variance)),
+                "variance": float(variance),
                 "min": float(np.min(values)),
                 "max": float(np.max(values)),
-                "q25": float(np.percentile(values, 25)),
-                "q75": float(np.percentile(values, 75))
+                "q25": float(q25),
+                "q75": float(q75)
             })
         else:
             stats_map = {
@@ -1427,7 +1422,7 @@ def get_vendor_resolver() -> VendorResolver:
     if _vendor_resolver is None and FEATURES.get('central_vendor_resolver', False):
         try:
             db_manager.ensure_database_exists()
-            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            conn = configure_connection(sqlite3.connect(DB_PATH, check_same_thread=False))
             _vendor_resolver = VendorResolver(
                 db_connection=conn,
                 known_mappings=KNOWN_VENDOR_MAPPINGS,
@@ -9,7 +9,11 @@ import os
 import re
 import json
 import logging
-import xml.etree.ElementTree as ET
+# Prefer lxml's C parser for LLM XML output; stdlib ElementTree is API-compatible here
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import asdict
 from functools import lru_cache
@@ -302,6 +306,21 @@ class LLMQueryDecomposer:
         
         return response_text
 
+    def _parse_analysis_xml(self, response_text: str):
+        """
+        Parse the <analysis> element from an LLM response.
+        The element is located with find/rfind and parsed strictly; malformed XML
+        (stray '&' or '<', missing closing tag) raises so the regex fallback keeps the exact text.
+        """
+        start = response_text.find('<analysis>')
+        if start == -1:
+            raise ValueError("No <analysis> tag found in the response.")
+        
+        end = response_text.rfind('</analysis>')
+        if end < start:
+            raise ValueError("No closing </analysis> tag found in the response.")
+        return ET.fromstring(response_text[start:end + len('</analysis>')])
+
     # ============================================
     # UNIFIED ANALYSIS METHOD
     # ============================================
@@ -339,13 +358,7 @@ class LLMQueryDecomposer:
             # Parse the XML response
             try:
                 response_text = llm_response.content
-                # Clean the response to grab only the XML part
-                xml_match = re.search(r'<analysis>.*</analysis>', response_text, re.DOTALL)
-                if not xml_match:
-                    raise ValueError("No <analysis> tag found in the response.")
-                
-                xml_str = xml_match.group(0)
-                root = ET.fromstring(xml_str)
+                root = self._parse_analysis_xml(response_text)
 
                 # Helper to safely get text from an element
                 def get_text(element, tag):
@@ -1,38 +1,73 @@
 import requests
-import json
+import orjson
 import time
 import logging
-from datetime import datetime
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
 
 # --- Configuration ---
 BASE_URL = "http://127.0.0.1:8080"
-# Generate a timestamped filename for the JSON output
+# Generate timestamped filenames for the streamed JSON Lines log and the optional aggregated JSON
 TIMESTAMP = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 OUTPUT_FILE = f"test_results_{TIMESTAMP}.json"
+RESULTS_FILE = OUTPUT_FILE.replace('.json', '.jsonl')
+# Independent test cases within a complexity group run concurrently
+MAX_WORKERS = 4
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Results hold only strings, headers and already-parsed JSON bodies; one record per line
+RESULT_JSON_OPTIONS = orjson.OPT_APPEND_NEWLINE
 
 # --- Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-TEST_RESULTS = []
 SUCCESS_COUNT = 0
 FAILURE_COUNT = 0
+RESULTS_LOCK = threading.Lock()
 
-def run_test(name: str, complexity: str, method: str, endpoint: str, payload: dict = None, timeout: int = 120):
+# Shared keep-alive session so every test reuses pooled connections to the API
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+
+def _emit_trace_line(level, message: str):
+    """Prints a trace line, or logs it when a log level is given."""
+    if level is None:
+        print(message, flush=True)
+    else:
+        logging.log(level, message)
+
+def run_test(name: str, complexity: str, method: str, endpoint: str, payload: dict = None, timeout: int = 120,
+             results_fp=None, buffer_output: bool = False) -> dict:
     """
-    Sends a request, logs detailed trace info, and stores the result for JSON output.
+    Sends a request, logs detailed trace info, and returns the result.
+    When results_fp (a binary file) is given, the result is also appended to it as one JSON line.
+    With buffer_output, the trace is held back and emitted as one block when the test finishes,
+    so concurrently running tests do not interleave their output.
     """
-    global SUCCESS_COUNT, FAILURE_COUNT, TEST_RESULTS
+    global SUCCESS_COUNT, FAILURE_COUNT
     url = f"{BASE_URL}{endpoint}"
+    # Buffered trace lines as (log level, message), with None meaning a plain print
+    trace = []
+
+    def emit(level, message: str):
+        if buffer_output:
+            trace.append((level, message))
+        else:
+            _emit_trace_line(level, message)
     
     # --- Step 1: Log the test initiation ---
-    logging.info(f"--- [STARTING TEST] Name: '{name}' | Complexity: {complexity} ---")
-    print(f"  - Target     : {method.upper()} {url}")
+    emit(logging.INFO, f"--- [STARTING TEST] Name: '{name}' | Complexity: {complexity} ---")
+    emit(None, f"  - Target     : {method.upper()} {url}")
+    # Serialize the payload once; the same bytes are logged and sent as the request body
+    payload_bytes = orjson.dumps(payload) if payload is not None else None
     if payload:
-        print(f"  - Payload    : {json.dumps(payload)}")
+        emit(None, f"  - Payload    : {payload_bytes.decode()}")
 
     result_log = {
         "test_name": name,
         "complexity": complexity,
-        "timestamp_utc": datetime.utcnow().isoformat(),
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
         "status": "FAILURE", # Default to failure
         "request": {
             "method": method.upper(),
@@ -46,9 +81,10 @@ def run_test(name: str, complexity: str, method: str, endpoint: str, payload: di
         start_time = time.perf_counter()
         # --- Step 2: Execute the HTTP request ---
         if method.upper() == 'POST':
-            response = requests.post(url, json=payload, timeout=timeout)
+            headers = JSON_HEADERS if payload_bytes is not None else None
+            response = SESSION.post(url, data=payload_bytes, headers=headers, timeout=timeout)
         else:
-            response = requests.get(url, timeout=timeout)
+            response = SESSION.get(url, timeout=timeout)
         end_time = time.perf_counter()
         
         duration_seconds = end_time - start_time
@@ -59,46 +95,78 @@ def run_test(name: str, complexity: str, method: str, endpoint: str, payload: di
         # --- Step 3: Parse and log the outcome ---
         if 200 <= response.status_code < 300:
             result_log["status"] = "SUCCESS"
-            SUCCESS_COUNT += 1
-            logging.info(f"  - Result     : ✅ SUCCESS ({response.status_code}) in {duration_seconds:.2f}s")
+            with RESULTS_LOCK:
+                SUCCESS_COUNT += 1
+            emit(logging.INFO, f"  - Result     : ✅ SUCCESS ({response.status_code}) in {duration_seconds:.2f}s")
             try:
-                result_log["response"]["body"] = response.json()
-            except json.JSONDecodeError:
+                result_log["response"]["body"] = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
                 result_log["response"]["body"] = "Error: Response was not valid JSON."
-                logging.warning("Response was not valid JSON.")
+                emit(logging.WARNING, "Response was not valid JSON.")
         else:
-            FAILURE_COUNT += 1
-            logging.error(f"  - Result     : ❌ FAILURE ({response.status_code}) in {duration_seconds:.2f}s")
+            with RESULTS_LOCK:
+                FAILURE_COUNT += 1
+            emit(logging.ERROR, f"  - Result     : ❌ FAILURE ({response.status_code}) in {duration_seconds:.2f}s")
             result_log["response"]["body"] = response.text
             
     except requests.exceptions.RequestException as e:
-        FAILURE_COUNT += 1
+        with RESULTS_LOCK:
+            FAILURE_COUNT += 1
         end_time = time.perf_counter()
         duration_seconds = end_time - start_time if 'start_time' in locals() else -1
-        logging.error(f"  - Result     : ❌ FAILURE (Request Exception) in {duration_seconds:.2f}s")
+        emit(logging.ERROR, f"  - Result     : ❌ FAILURE (Request Exception) in {duration_seconds:.2f}s")
         error_message = f"Request failed: {str(e)}"
         result_log["response"] = {"error": error_message}
-        print(f"    {error_message}")
+        emit(None, f"    {error_message}")
         
     finally:
-        # --- Step 4: Store the result and conclude the test ---
-        TEST_RESULTS.append(result_log)
-        print("-" * 60)
+        # --- Step 4: Write the result immediately and conclude the test ---
+        line = orjson.dumps(result_log, option=RESULT_JSON_OPTIONS) if results_fp is not None else None
+        with RESULTS_LOCK:
+            if line is not None:
+                results_fp.write(line)
+                results_fp.flush()
+            for level, message in trace:
+                _emit_trace_line(level, message)
+            print("-" * 60, flush=True)
+
+    return result_log
+
+def run_test_group(tests: list, complexity: str, results_fp=None, serial: bool = False) -> list:
+    """Runs a group of independent tests, concurrently unless serial is requested."""
+    if serial:
+        # Serial runs log live so slow tests show progress as they go
+        return [run_test(complexity=complexity, results_fp=results_fp, **test) for test in tests]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(
+            lambda test: run_test(complexity=complexity, results_fp=results_fp, buffer_output=True, **test), tests))
+
+def load_results_from_jsonl(filename: str) -> list:
+    """Loads the streamed test results back from a JSON Lines file."""
+    with open(filename, 'rb') as f:
+        return [orjson.loads(line) for line in f if line.strip()]
 
 def save_results_to_json(results: list, filename: str):
     """Saves the list of test results to a JSON file."""
     logging.info(f"Attempting to save {len(results)} test results to '{filename}'...")
     try:
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=4)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(results, option=RESULT_JSON_OPTIONS | orjson.OPT_INDENT_2))
         logging.info(f"✅ Successfully saved test results to '{filename}'.")
     except Exception as e:
         logging.error(f"❌ Failed to save results to JSON file: {e}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the detailed API test suite.")
+    parser.add_argument("--serial", action="store_true", help="Run tests one at a time (useful for debugging)")
+    parser.add_argument("--aggregate-json", action="store_true", help="Also re-emit the JSON Lines results as one indented JSON file")
+    args = parser.parse_args()
+
     # Test cases are the same as before
-    simple_queries = [
+    setup_queries = [
         {"name": "Health Check", "method": "GET", "endpoint": "/health"},
+    ]
+    simple_queries = [
         {"name": "Top 5 Vendors", "method": "GET", "endpoint": "/top-vendors?n=5"},
         {"name": "Statistical Mean", "method": "POST", "endpoint": "/statistics/mean", "payload": {}},
         {"name": "Specific Vendor Details", "method": "GET", "endpoint": "/vendor/DELL COMPUTER CORP"},
@@ -119,16 +187,22 @@ if __name__ == "__main__":
     logging.info("🚀 STARTING APPLICATION FUNCTIONALITY TEST SUITE 🚀")
     print("=" * 60)
 
-    print("\n--- Running Simple Queries ---")
-    for test in simple_queries: run_test(complexity="Simple", **test)
+    with open(RESULTS_FILE, 'wb') as results_fp:
+        print("\n--- Running Setup Checks ---")
+        run_test_group(setup_queries, "Simple", results_fp, serial=True)
 
-    print("\n--- Running Medium Queries ---")
-    for test in medium_queries: run_test(complexity="Medium", **test)
-        
-    print("\n--- Running Complex Queries ---")
-    for test in complex_queries: run_test(complexity="Complex", **test)
+        print("\n--- Running Simple Queries ---")
+        run_test_group(simple_queries, "Simple", results_fp, serial=args.serial)
+
+        print("\n--- Running Medium Queries ---")
+        run_test_group(medium_queries, "Medium", results_fp, serial=args.serial)
+            
+        print("\n--- Running Complex Queries ---")
+        run_test_group(complex_queries, "Complex", results_fp, serial=args.serial)
         
-    save_results_to_json(TEST_RESULTS, OUTPUT_FILE)
+    SESSION.close()
+    if args.aggregate_json:
+        save_results_to_json(load_results_from_jsonl(RESULTS_FILE), OUTPUT_FILE)
 
     print("\n" + "="*60)
     logging.info("✨ TEST SUITE COMPLETE ✨")
@@ -136,5 +210,7 @@ if __name__ == "__main__":
     print(f"  TOTAL TESTS : {SUCCESS_COUNT + FAILURE_COUNT}")
     print(f"  ✅ SUCCESS   : {SUCCESS_COUNT}")
     print(f"  ❌ FAILURE   : {FAILURE_COUNT}")
-    print(f"  Detailed results saved to: {OUTPUT_FILE}")
+    print(f"  Detailed results saved to: {RESULTS_FILE}")
+    if args.aggregate_json:
+        print(f"  Aggregated JSON saved to : {OUTPUT_FILE}")
     print("=" * 60)
\ No newline at end of file
@@ -5,10 +5,50 @@ Separate module to avoid circular imports
 
 import re
 import logging
-from typing import Any
+from typing import Any, List, Pattern, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import time and reused by every extraction call
+_INSUFFICIENT_RE = re.compile(r'<INSUFFICIENT_DATA>(.*?)</INSUFFICIENT_DATA>', re.IGNORECASE | re.DOTALL)
+# Numbered blocks (<REC1>..</REC1> through <FINDING10>..</FINDING10>) are matched in one pass via backreference.
+# Each pattern carries its field structure and sits in a lookahead, so every start position is tried just as
+# a per-index search would, and a stray opening tag cannot swallow the real block that follows it.
+_REC_BLOCK = re.compile(
+    r'(?=<REC(10|[1-9])>\s*<ACTION>(.*?)</ACTION>\s*<JUSTIFICATION>(.*?)</JUSTIFICATION>\s*'
+    r'(?:<PRIORITY>(.*?)</PRIORITY>)?\s*</REC\1>)',
+    re.IGNORECASE | re.DOTALL
+)
+_FINDING_BLOCK = re.compile(r'(?=<FINDING(10|[1-9])>(.*?)</FINDING\1>)', re.IGNORECASE | re.DOTALL)
+_SUMMARY_RE = re.compile(r'<summary>(.*?)</summary>', re.IGNORECASE | re.DOTALL)
+_VENDOR_RE = re.compile(r'<vendor>(.*?)</vendor>', re.IGNORECASE | re.DOTALL)
+_NAME_RE = re.compile(r'<name>(.*?)</name>', re.IGNORECASE | re.DOTALL)
+_PERFORMANCE_RE = re.compile(r'<performance>(.*?)</performance>', re.IGNORECASE | re.DOTALL)
+_STRENGTHS_RE = re.compile(r'<strengths>(.*?)</strengths>', re.IGNORECASE | re.DOTALL)
+_CONCERNS_RE = re.compile(r'<concerns>(.*?)</concerns>', re.IGNORECASE | re.DOTALL)
+_REC_RE = re.compile(r'<recommendation>(.*?)</recommendation>', re.IGNORECASE | re.DOTALL)
+_BUSINESS_IMPACT_RE = re.compile(r'<BUSINESS_IMPACT>(.*?)</BUSINESS_IMPACT>', re.IGNORECASE | re.DOTALL)
+_RECOMMENDATIONS_RE = re.compile(r'<RECOMMENDATIONS>(.*?)</RECOMMENDATIONS>', re.IGNORECASE | re.DOTALL)
+# <ANSWER> and <RESPONSE> blocks share one scan; the backreference pairs each with its own closing tag, and the
+# lookahead tries every start position so overlapping or crossing blocks are found as separate searches would
+_SYNTHESIS_RE = re.compile(r'(?=<(ANSWER|RESPONSE)>(.*?)</\1>)', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+# Dispatch markers, collected in one scan instead of one substring search per marker
+_TEMPLATE_MARKER_RE = re.compile(
+    r'<(RECOMMENDATIONS_START|REC1|COMPARISON_START|VENDOR1|STATISTICAL_ANALYSIS|FINDING1|RESPONSE_START|ANSWER|INSUFFICIENT_DATA)>'
+)
+
+def extract_numbered_blocks(block_re: Pattern, text: str) -> List[Tuple[int, tuple]]:
+    """
+    Collect numbered template blocks in a single pass.
+    block_re captures the index followed by the block's fields.
+    Returns (index, fields) in numeric order, keeping the first block found for each index.
+    """
+    found = {}
+    for block in block_re.finditer(text):
+        found.setdefault(int(block.group(1)), block.groups()[1:])
+    return sorted(found.items())
+
 def extract_from_template_response(response_text: str) -> str:
     """
     Extract readable content from template-formatted responses.
@@ -17,26 +57,27 @@ def extract_from_template_response(response_text: str) -> str:
     if not response_text or not isinstance(response_text, str):
         return response_text
     
+    markers = set(_TEMPLATE_MARKER_RE.findall(response_text))
+    
     # Check for recommendation template
-    if '<RECOMMENDATIONS_START>' in response_text or '<REC1>' in response_text:
+    if 'RECOMMENDATIONS_START' in markers or 'REC1' in markers:
         return extract_recommendation_template(response_text)
     
     # Check for comparison template
-    if '<COMPARISON_START>' in response_text or '<VENDOR1>' in response_text:
+    if 'COMPARISON_START' in markers or 'VENDOR1' in markers:
         return extract_comparison_template(response_text)
     
     # Check for statistical template
-    if '<STATISTICAL_ANALYSIS>' in response_text or '<FINDING1>' in response_text:
+    if 'STATISTICAL_ANALYSIS' in markers or 'FINDING1' in markers:
         return extract_statistical_template(response_text)
     
     # Check for synthesis/general template
-    if '<RESPONSE_START>' in response_text or '<ANSWER>' in response_text:
+    if 'RESPONSE_START' in markers or 'ANSWER' in markers:
         return extract_synthesis_template(response_text)
     
     # Check for insufficient data
-    if '<INSUFFICIENT_DATA>' in response_text:
-        match = re.search(r'<INSUFFICIENT_DATA>(.*?)</INSUFFICIENT_DATA>', 
-                         response_text, re.IGNORECASE | re.DOTALL)
+    if 'INSUFFICIENT_DATA' in markers:
+        match = _INSUFFICIENT_RE.search(response_text)
         if match:
             return match.group(1).strip()
     
@@ -47,8 +88,7 @@ def extract_from_template_response(response_text: str) -> str:
 def extract_recommendation_template(response_text: str) -> str:
     """Extract and format recommendation template responses"""
     # Check for insufficient data first
-    insufficient_match = re.search(r'<INSUFFICIENT_DATA>(.*?)</INSUFFICIENT_DATA>', 
-                                 response_text, re.IGNORECASE | re.DOTALL)
+    insufficient_match = _INSUFFICIENT_RE.search(response_text)
     if insufficient_match:
         return insufficient_match.group(1).strip()
     
@@ -56,14 +96,9 @@ def extract_recommendation_template(response_text: str) -> str:
     formatted = []
     
     # Try numbered recommendations
-    for i in range(1, 11):  # Support up to 10 recommendations
-        rec_pattern = f'<REC{i}>\\s*<ACTION>(.*?)</ACTION>\\s*<JUSTIFICATION>(.*?)</JUSTIFICATION>\\s*(?:<PRIORITY>(.*?)</PRIORITY>)?\\s*</REC{i}>'
-        match = re.search(rec_pattern, response_text, re.IGNORECASE | re.DOTALL)
-        if match:
-            action = match.group(1).strip()
-            justification = match.group(2).strip()
-            priority = match.group(3).strip() if match.group(3) else "Medium"
-            formatted.append(f"{i}. {action} (Priority: {priority})\n   Justification: {justification}")
+    for i, (action, justification, priority) in extract_numbered_blocks(_REC_BLOCK, response_text):
+        priority = priority.strip() if priority else "Medium"
+        formatted.append(f"{i}. {action.strip()} (Priority: {priority})\n   Justification: {justification.strip()}")
     
     if formatted:
         return "Strategic Recommendations:\n\n" + "\n\n".join(formatted)
@@ -76,17 +111,17 @@ def extract_comparison_template(response_text: str) -> str:
     result = []
     
     # Extract summary
-    summary_match = re.search(r'<summary>(.*?)</summary>', response_text, re.IGNORECASE | re.DOTALL)
+    summary_match = _SUMMARY_RE.search(response_text)
     if summary_match:
         result.append(f"Summary: {summary_match.group(1).strip()}\n")
     
     # Extract vendor analyses
-    for vendor_match in re.finditer(r'<vendor>(.*?)</vendor>', response_text, re.IGNORECASE | re.DOTALL):
+    for vendor_match in _VENDOR_RE.finditer(response_text):
         vendor_xml = vendor_match.group(1)
-        name_match = re.search(r'<name>(.*?)</name>', vendor_xml, re.IGNORECASE | re.DOTALL)
-        performance_match = re.search(r'<performance>(.*?)</performance>', vendor_xml, re.IGNORECASE | re.DOTALL)
-        strengths_match = re.search(r'<strengths>(.*?)</strengths>', vendor_xml, re.IGNORECASE | re.DOTALL)
-        concerns_match = re.search(r'<concerns>(.*?)</concerns>', vendor_xml, re.IGNORECASE | re.DOTALL)
+        name_match = _NAME_RE.search(vendor_xml)
+        performance_match = _PERFORMANCE_RE.search(vendor_xml)
+        strengths_match = _STRENGTHS_RE.search(vendor_xml)
+        concerns_match = _CONCERNS_RE.search(vendor_xml)
 
         if name_match:
             name = name_match.group(1).strip()
@@ -100,7 +135,7 @@ def extract_comparison_template(response_text: str) -> str:
             result.append(f"Concerns: {concerns}\n")
 
     # Extract recommendation
-    rec_match = re.search(r'<recommendation>(.*?)</recommendation>', response_text, re.IGNORECASE | re.DOTALL)
+    rec_match = _REC_RE.search(response_text)
     if rec_match:
         result.append(f"Recommendation: {rec_match.group(1).strip()}")
     
@@ -114,17 +149,14 @@ def extract_statistical_template(response_text: str) -> str:
     result = []
     
     # Extract summary
-    summary_match = re.search(r'<SUMMARY>(.*?)</SUMMARY>', response_text, re.IGNORECASE | re.DOTALL)
+    summary_match = _SUMMARY_RE.search(response_text)
     if summary_match:
         result.append(f"Summary: {summary_match.group(1).strip()}\n")
     
     # Extract findings
     findings = []
-    for i in range(1, 11):  # Support up to 10 findings
-        finding_pattern = f'<FINDING{i}>(.*?)</FINDING{i}>'
-        match = re.search(finding_pattern, response_text, re.IGNORECASE | re.DOTALL)
-        if match:
-            findings.append(f"{i}. {match.group(1).strip()}")
+    for i, (finding,) in extract_numbered_blocks(_FINDING_BLOCK, response_text):
+        findings.append(f"{i}. {finding.strip()}")
     
     if findings:
         result.append("Key Findings:")
@@ -132,12 +164,12 @@ def extract_statistical_template(response_text: str) -> str:
         result.append("")
     
     # Extract business impact
-    impact_match = re.search(r'<BUSINESS_IMPACT>(.*?)</BUSINESS_IMPACT>', response_text, re.IGNORECASE | re.DOTALL)
+    impact_match = _BUSINESS_IMPACT_RE.search(response_text)
     if impact_match:
         result.append(f"Business Impact: {impact_match.group(1).strip()}\n")
     
     # Extract recommendations
-    rec_match = re.search(r'<RECOMMENDATIONS>(.*?)</RECOMMENDATIONS>', response_text, re.IGNORECASE | re.DOTALL)
+    rec_match = _RECOMMENDATIONS_RE.search(response_text)
     if rec_match:
         result.append(f"Recommendations: {rec_match.group(1).strip()}")
     
@@ -148,23 +180,23 @@ def extract_statistical_template(response_text: str) -> str:
 
 def extract_synthesis_template(response_text: str) -> str:
     """Extract and format synthesis/general template responses"""
-    # Try to extract main answer
-    answer_match = re.search(r'<ANSWER>(.*?)</ANSWER>', response_text, re.IGNORECASE | re.DOTALL)
-    if answer_match:
-        return answer_match.group(1).strip()
+    # Walk <ANSWER>/<RESPONSE> blocks once; the main answer wins over response content
+    response_content = None
+    for match in _SYNTHESIS_RE.finditer(response_text):
+        if match.group(1).upper() == 'ANSWER':
+            return match.group(2).strip()
+        if response_content is None:
+            response_content = match.group(2).strip()
 
-    # Try to extract response content
-    response_match = re.search(r'<RESPONSE>(.*?)</RESPONSE>', response_text, re.IGNORECASE | re.DOTALL)
-    if response_match:
-        return response_match.group(1).strip()
+    if response_content is not None:
+        return response_content
 
-    # Fallback to cleaning tags
+    # Fallback to cleaning tags only when no answer or response block matched
     return clean_template_tags(response_text)
 
 def clean_template_tags(text: str) -> str:
     """Remove all template tags from text"""
     # Remove all XML-like tags
-    cleaned = re.sub(r'<[^>]+>', '', text)
-    # Clean up extra whitespace
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    return cleaned.strip()
\ No newline at end of file
+    cleaned = _TAG_RE.sub('', text)
+    # Collapse runs of whitespace (str.split also drops leading/trailing whitespace)
+    return ' '.join(cleaned.split())
\ No newline at end of file